@@ -1,25 +1,41 @@
+import calendar
 from collections import UserDict
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import re
+import sys
+
+
+_BIRTHDAY_RE = re.compile(r'^\d{2}\.\d{2}\.\d{4}$')
 
 
 class Field:
+    __slots__ = ('_value',)
+
     def __init__(self, value):
-        self.value = value
+        self._value = value
+
+    @property
+    def value(self):
+        # Лише для читання: значення є ключем у словниках запису та книги
+        return self._value
 
     def __str__(self):
         return str(self.value)
 
 
 class Name(Field):
+    __slots__ = ()
+
     def __init__(self, value):
-        super().__init__(value)
+        super().__init__(sys.intern(value))  # Ім'я є ключем книги
 
 
 class Phone(Field):
+    __slots__ = ()
+
     def __init__(self, value):
-        if len(value) == 10 and value.isdigit():
-            super().__init__(value)
+        if len(value) == 10 and value.isascii() and value.isdigit():
+            super().__init__(sys.intern(value))  # Однакові номери - один об'єкт рядка
         else:
             raise ValueError("Invalid phone number format: must be exactly 10 digits")
 
@@ -28,48 +44,89 @@ class Phone(Field):
 
 
 class Birthday(Field):
+    __slots__ = ('_str',)
+
     def __init__(self, value):
+        if not _BIRTHDAY_RE.match(value):
+            raise ValueError("Invalid date format. Use DD.MM.YYYY")
         try:
-            pattern = r'\b\d{2}\.\d{2}\.\d{4}\b'
-            match = re.search(pattern, value)
-            if match:
-                date_value = datetime.strptime(value, '%d.%m.%Y').date()
-                super().__init__(date_value)
-            else:
-                raise ValueError("Invalid date format. Use DD.MM.YYYY")
+            date_value = datetime.strptime(value, '%d.%m.%Y').date()
         except ValueError as e:
             raise ValueError("Invalid date format. Use DD.MM.YYYY") from e
+        super().__init__(date_value)
+        self._str = date_value.strftime('%d.%m.%Y')  # Форматуємо один раз при створенні
 
     def __str__(self):
-        return self.value.strftime('%d.%m.%Y')
+        return self._str
 
 
 class Record:
+    __slots__ = ('_name', 'phones', '_books', '_birthday', '_str_cache')
+
     def __init__(self, name):
-        self.name = Name(name)
-        self.phones = []
+        self._name = Name(name)
+        self.phones = {}
+        self._books = []  # Пари (книга, ключ), під якими збережено запис
+        # Поля незмінні, тож кеш скидають лише методи запису, що змінюють телефони
+        # або день народження; self.phones слід змінювати тільки через них
+        self._str_cache = None
         self.birthday = None
 
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def birthday(self):
+        return self._birthday
+
+    @birthday.setter
+    def birthday(self, birthday):
+        self._birthday = birthday
+        self._str_cache = None
+        for book, key in self._books:
+            book._index_birthday(key, self)  # Оновити індекс днів народження книги
+
     def add_phone(self, phone):
-        self.phones.append(Phone(phone))
+        self.add_phone_obj(Phone(phone))
+
+    def add_phone_obj(self, phone):
+        # Додати вже перевірений об'єкт Phone без повторної валідації
+        if phone.value in self.phones:
+            raise ValueError("Phone already exists")
+        self.phones[phone.value] = phone
+        self._str_cache = None
 
     def remove_phone(self, phone):
-        for p in self.phones:
-            if p.value == phone:
-                self.phones.remove(p)
-                break
+        if self.phones.pop(phone, None) is not None:
+            self._str_cache = None
 
     def edit_phone(self, old_phone, new_phone):
-        phone = self.find_phone(old_phone)
-        if phone:
-            phone.value = new_phone
-        else:
+        if old_phone not in self.phones:
             raise ValueError("Phone not found")
+        if not isinstance(new_phone, Phone):
+            new_phone = Phone(new_phone)
+        if new_phone.value != old_phone and new_phone.value in self.phones:
+            raise ValueError("Phone already exists")
+        phones = self.phones
+        if new_phone.value == old_phone:
+            phones[old_phone] = new_phone
+        else:
+            # Змінюємо словник на місці, зберігаючи порядок: телефони після зміненого
+            # виймаємо й повертаємо назад, тож ціна - O(кількість телефонів після нього)
+            tail = []
+            for value in reversed(phones):
+                if value == old_phone:
+                    break
+                tail.append(value)
+            tail = [(value, phones.pop(value)) for value in reversed(tail)]
+            del phones[old_phone]
+            phones[new_phone.value] = new_phone
+            phones.update(tail)
+        self._str_cache = None
 
     def find_phone(self, phone):
-        for p in self.phones:
-            if p.value == phone:
-                return p
+        return self.phones.get(phone)
 
     def add_birthday(self, birthday):
         self.birthday = Birthday(birthday)
@@ -78,38 +135,109 @@ class Record:
         return self.birthday
 
     def __str__(self):
-        phones = "; ".join(str(p) for p in self.phones)
-        birthday_str = f", birthday: {self.birthday}" if self.birthday else ""
-        return f"Contact name: {self.name}, phones: {phones}{birthday_str}"
+        if self._str_cache is None:
+            phones = "; ".join([str(p) for p in self.phones.values()])
+            birthday_str = f", birthday: {self.birthday}" if self.birthday else ""
+            self._str_cache = f"Contact name: {self.name}, phones: {phones}{birthday_str}"
+        return self._str_cache
 
 
 class AddressBook(UserDict):
+    def __init__(self, *args, **kwargs):
+        # Ключ -> (місяць, день) лише для записів з днем народження
+        self._birthday_index = {}
+        # (місяць, день) -> ключі книги (dict як впорядкована множина), щоб не перебирати
+        # всю книгу; самі записи беремо з self.data
+        self._birthday_buckets = {}
+        super().__init__(*args, **kwargs)
+
+    # Усі зміни книги (add_record, delete, book[k] = r, del, pop, update, clear, |=, ...)
+    # проходять через __setitem__ та __delitem__, тож індекс завжди узгоджений з self.data
+    def __setitem__(self, key, record):
+        if not isinstance(record, Record):
+            raise ValueError("Only Record objects can be added to the AddressBook.")
+        if key in self.data:
+            del self[key]
+        self.data[key] = record
+        record._books.append((self, key))
+        self._index_birthday(key, record)
+
+    def __delitem__(self, key):
+        record = self.data.pop(key)
+        record._books = [(book, k) for book, k in record._books if book is not self or k != key]
+        self._unindex_birthday(key)
+
+    def __ior__(self, other):
+        # UserDict.__ior__ пише напряму в self.data, оминаючи індекс і перевірку типу
+        self.update(other)
+        return self
+
+    def __copy__(self):
+        # Копія будує власний індекс, а не ділить його з оригіналом
+        new_book = self.__class__()
+        new_book.update(self.data)
+        return new_book
+
+    def copy(self):
+        return self.__copy__()
+
     def add_record(self, record):
         if not isinstance(record, Record):
             raise ValueError("Only Record objects can be added to the AddressBook.")
-        self.data[record.name.value] = record
+        self[record.name.value] = record
 
     def find(self, name):
         return self.data.get(name)
 
     def delete(self, name):
         if name in self.data:
-            del self.data[name]
+            del self[name]
+
+    def _index_birthday(self, key, record):
+        self._unindex_birthday(key)
+        if record.birthday:
+            birthday_date = record.birthday.value
+            month_day = (birthday_date.month, birthday_date.day)
+            self._birthday_index[key] = month_day
+            self._birthday_buckets.setdefault(month_day, {})[key] = None
+
+    def _unindex_birthday(self, key):
+        month_day = self._birthday_index.pop(key, None)
+        if month_day is not None:
+            bucket = self._birthday_buckets[month_day]
+            del bucket[key]
+            if not bucket:
+                del self._birthday_buckets[month_day]
 
     def get_upcoming_birthdays(self, days=7):
         upcoming_birthdays = []
-        today = datetime.now().date()
-        for record in self.data.values():
-            if isinstance(record, Record) and record.birthday:
-                birthday_date = record.birthday.value
-                birthday_this_year = birthday_date.replace(year=today.year)
-                if birthday_this_year < today:
-                    birthday_this_year = birthday_this_year.replace(year=today.year + 1)
-                birthday_this_year = self.adjust_for_weekend(birthday_this_year)
-                if today <= birthday_this_year <= today + timedelta(days=days):
-                    upcoming_birthdays.append(
-                        {"name": record.name.value, "birthday": birthday_this_year.strftime("%d.%m.%Y")}
-                    )
+        today_ord = datetime.now().date().toordinal()
+        end_ord = today_ord + days
+        data = self.data
+        buckets = self._birthday_buckets
+        adjust_for_weekend = self.adjust_for_weekend
+        from_ordinal = date.fromordinal
+        seen = set()
+        # Перебрати дні вікна (не більше року) і взяти записи з відповідних кошиків
+        for day_ord in range(today_ord, today_ord + min(days, 366) + 1):
+            day_date = from_ordinal(day_ord)
+            month_days = [(day_date.month, day_date.day)]
+            if month_days[0] == (3, 1) and not calendar.isleap(day_date.year):
+                month_days.insert(0, (2, 29))  # 29 лютого у невисокосний рік святкуємо 1 березня
+            for month_day in month_days:
+                if month_day in seen:
+                    continue
+                seen.add(month_day)
+                bucket = buckets.get(month_day)
+                if not bucket:
+                    continue
+                congratulation_date = adjust_for_weekend(day_date)
+                if congratulation_date.toordinal() > end_ord:
+                    # Дата привітання не спадає з кожним днем, тож далі збігів не буде
+                    return upcoming_birthdays
+                congratulation_str = congratulation_date.strftime("%d.%m.%Y")
+                for name in bucket:
+                    upcoming_birthdays.append({"name": data[name].name.value, "birthday": congratulation_str})
         return upcoming_birthdays
 
     @staticmethod
@@ -132,7 +260,10 @@ def input_error(func):
 
 
 def parse_input(user_input):
-    return user_input.lower().strip().split()
+    parts = user_input.split()
+    if parts:
+        parts[0] = parts[0].lower()  # Регістр змінюємо лише для команди
+    return parts
 
 
 @input_error
@@ -152,14 +283,14 @@ def add_contact(args, book: AddressBook):
         message = "Contact added."
     else:
         message = "Contact updated."
-    record.add_phone(phone.value)
+    record.add_phone_obj(phone)
     return message
 
 
 @input_error
 def change_contact(book: AddressBook, name, new_phone):
     try:
-        new_phone = Phone(new_phone).value  # Validate phone number
+        new_phone = Phone(new_phone)  # Validate phone number
     except ValueError as e:
         return str(e)
 
@@ -167,7 +298,7 @@ def change_contact(book: AddressBook, name, new_phone):
     if record:
         if len(record.phones) == 0:
             return "No phone numbers to change."
-        old_phone = record.phones[0].value
+        old_phone = next(iter(record.phones))
         record.edit_phone(old_phone, new_phone)
         return "Contact updated."
     else:
@@ -178,14 +309,14 @@ def change_contact(book: AddressBook, name, new_phone):
 def show_phone(book: AddressBook, name):
     record = book.find(name)
     if record:
-        return ", ".join(str(phone) for phone in record.phones)
+        return ", ".join([str(phone) for phone in record.phones.values()])
     else:
         return "Contact not found."
 
 
 @input_error
 def show_all(book: AddressBook):
-    contacts_info = [str(record) for record in book.data.values() if isinstance(record, Record)]
+    contacts_info = [str(record) for record in book.data.values()]
     return '\n'.join(contacts_info) or "Contact list is empty."
 
 
@@ -228,6 +359,55 @@ def birthdays(book: AddressBook, days=7):
         return "No upcoming birthdays."
 
 
+def _handle_change(args, book):
+    if len(args) < 2:
+        return "Please provide a contact name and the new phone number."
+    return change_contact(book, args[0], args[1])
+
+
+def _handle_phone(args, book):
+    if not args:
+        return "Please provide a contact name for the phone command."
+    return show_phone(book, args[0])
+
+
+def _handle_add_birthday(args, book):
+    if len(args) < 2:
+        return "Please provide both a contact name and a birthday."
+    return add_birthday(book, args[0], args[1])
+
+
+def _handle_show_birthday(args, book):
+    if not args:
+        return "Please provide a contact name for the show-birthday command."
+    return show_birthday(book, args[0])
+
+
+def _handle_birthdays(args, book):
+    days = int(args[0]) if args else 7
+    result = birthdays(book, days)
+    if isinstance(result, str):
+        return result
+    lines = ["["]
+    lines.extend([f"    {entry}," for entry in result])
+    lines.append("]")
+    return "\n".join(lines)
+
+
+COMMANDS = {
+    "hello": lambda args, book: "How can I help you?",
+    "add": add_contact,
+    "change": _handle_change,
+    "phone": _handle_phone,
+    "all": lambda args, book: show_all(book),
+    "add-birthday": _handle_add_birthday,
+    "show-birthday": _handle_show_birthday,
+    "birthdays": _handle_birthdays,
+}
+
+EXIT_COMMANDS = frozenset({"close", "exit", "stop"})
+
+
 def main():
     book = AddressBook()
     print("Welcome to the assistant bot!")
@@ -239,46 +419,13 @@ def main():
 
         command, *args = parse_input(user_input)
 
-        if command in ["close", "exit", 'stop']:
+        if command in EXIT_COMMANDS:
             print("Goodbye!")
             break
-        elif command == "hello":
-            print("How can I help you?")
-
-        elif command == "add":
-            print(add_contact(args, book))
-        elif command == "change":
-            if len(args) < 2:
-                print("Please provide a contact name and the new phone number.")
-            else:
-                print(change_contact(book, args[0], args[1]))
-        elif command == "phone":
-            if args:
-                print(show_phone(book, args[0]))
-            else:
-                print("Please provide a contact name for the phone command.")
-        elif command == "all":
-            print(show_all(book))
-        elif command == "add-birthday":
-            if len(args) < 2:
-                print("Please provide both a contact name and a birthday.")
-            else:
-                print(add_birthday(book, args[0], args[1]))
-        elif command == "show-birthday":
-            if args:
-                print(show_birthday(book, args[0]))
-            else:
-                print("Please provide a contact name for the show-birthday command.")
-        elif command == "birthdays":
-            days = int(args[0]) if args else 7
-            result = birthdays(book, days)
-            if isinstance(result, str):
-                print(result)
-            else:
-                print("[")
-                for entry in result:
-                    print(f"    {entry},")
-                print("]")
+
+        handler = COMMANDS.get(command)
+        if handler:
+            print(handler(args, book))
         else:
             print("Invalid command. Please try again.")
 